@@ -1,5 +1,5 @@
 import streamlit as st
-import json
+import orjson
 from scorer import TranscriptScorer
 
 st.set_page_config(page_title="Student Introduction Scorer", page_icon="🎤", layout="wide")
@@ -16,8 +16,13 @@ This tool analyzes spoken self-introduction transcripts and provides scores base
 - **Engagement**: Emotional tone
 """)
 
-# Initialize scorer
-scorer = TranscriptScorer()
+# Initialize scorer once per process - loading the embedding model and
+# grammar tool is expensive, so it must not happen on every rerun
+@st.cache_resource
+def get_scorer():
+    return TranscriptScorer()
+
+scorer = get_scorer()
 
 # Sidebar with sample transcript
 with st.sidebar:
@@ -87,9 +92,8 @@ if st.button("🎯 Score Transcript", type="primary", use_container_width=True):
             
             for criterion in results['criteria']:
                 with st.expander(f"**{criterion['name']}** - Score: {criterion['score']:.1f}/{criterion['max_score']}", expanded=show_details):
-                    # Progress bar - Convert to float to avoid numpy float32 issues
-                    progress = float(criterion['score'] / criterion['max_score']) if criterion['max_score'] > 0 else 0.0
-                    st.progress(progress)
+                    # Progress bar
+                    st.progress(criterion['progress'])
                     
                     # Feedback
                     st.markdown(f"**Feedback:** {criterion['feedback']}")
@@ -111,8 +115,8 @@ if st.button("🎯 Score Transcript", type="primary", use_container_width=True):
             st.markdown("---")
             st.subheader("📄 JSON Output")
             with st.expander("View/Copy JSON Output"):
-                json_output = json.dumps(results, indent=2)
-                st.code(json_output, language='json')
+                json_output = orjson.dumps(results, option=orjson.OPT_INDENT_2)
+                st.code(json_output.decode(), language='json')
                 st.download_button(
                     label="Download JSON",
                     data=json_output,
@@ -0,0 +1,178 @@
+import json
+import os
+import re
+
+import numpy as np
+
+# BERT-style pre-tokenization: runs of word characters, or single punctuation marks
+_PRETOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+
+class TorchEncoder:
+    """SentenceTransformer tuned for CPU inference.
+    
+    Caps the torch thread pool, runs encode() under inference_mode, and when
+    intel-extension-for-pytorch is installed on a bfloat16-capable CPU,
+    optimizes the model with IPEX and encodes under bf16 autocast.
+    """
+    
+    def __init__(self, model_name='all-MiniLM-L6-v2'):
+        import torch
+        from sentence_transformers import SentenceTransformer
+        
+        _configure_torch_threads(torch)
+        self._torch = torch
+        self.model = SentenceTransformer(model_name)
+        self.bf16 = False
+        
+        bf16_supported = getattr(torch.cpu, '_is_avx512_bf16_supported', lambda: False)()
+        if self.model.device.type == 'cpu' and bf16_supported:
+            try:
+                import intel_extension_for_pytorch as ipex
+                self.model = ipex.optimize(self.model.eval(), dtype=torch.bfloat16)
+                self.bf16 = True
+            except Exception:
+                pass  # IPEX not installed; stay on the FP32 model
+    
+    def encode(self, sentences, **kwargs):
+        """SentenceTransformer.encode without autograd bookkeeping"""
+        # Grad mode is thread-local, so inference_mode is entered per call rather
+        # than disabled once at load time; encode also runs on pool threads
+        with self._torch.inference_mode():
+            if self.bf16:
+                with self._torch.autocast('cpu', dtype=self._torch.bfloat16):
+                    return self.model.encode(sentences, **kwargs)
+            return self.model.encode(sentences, **kwargs)
+
+
+_torch_threads_configured = False
+
+def _configure_torch_threads(torch):
+    """Use at most 8 intra-op threads; larger pools only add overhead for short inputs"""
+    global _torch_threads_configured
+    if not _torch_threads_configured:
+        torch.set_num_threads(min(8, os.cpu_count() or 1))
+        _torch_threads_configured = True
+
+
+class OnnxEncoder:
+    """INT8-quantized ONNX Runtime export of all-MiniLM-L6-v2.
+    
+    Exposes the same encode() call the scorer uses on SentenceTransformer,
+    so the two can be swapped without touching the callers.
+    """
+    
+    def __init__(self, model_dir, tokenizer_name='sentence-transformers/all-MiniLM-L6-v2', max_length=256):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+        self.session = ORTModelForFeatureExtraction.from_pretrained(model_dir, file_name='model_quantized.onnx')
+        self.max_length = max_length
+    
+    def encode(self, sentences, batch_size=32, normalize_embeddings=False, convert_to_numpy=True):
+        """Tokenize, run the ONNX session and mean-pool the token embeddings"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            tokens = self.tokenizer(
+                sentences[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors='np'
+            )
+            outputs = self.session(**tokens)
+            token_embeddings = np.asarray(outputs.last_hidden_state, dtype=np.float32)
+            
+            # Mean pooling over real (non-padding) tokens, as sentence-transformers does
+            mask = tokens['attention_mask'][..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            counts = np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(summed / counts)
+        
+        embeddings = np.concatenate(batches) if batches else np.zeros((0, 384), dtype=np.float32)
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+        
+        return embeddings[0] if single else embeddings
+
+
+class StaticEmbedder:
+    """Static token-embedding table with mean pooling.
+    
+    Every WordPiece token maps to one precomputed vector, so encoding a sentence
+    is a table lookup and an average instead of a transformer forward pass.
+    Build the table with export_static_embeddings().
+    """
+    
+    def __init__(self, model_dir):
+        self.embeddings = np.load(os.path.join(model_dir, 'embeddings.npy'))
+        with open(os.path.join(model_dir, 'vocab.json'), encoding='utf-8') as f:
+            self.vocab = json.load(f)
+    
+    def _token_ids(self, text):
+        """Greedy longest-match WordPiece tokenization; words that cannot be split are skipped"""
+        ids = []
+        for word in _PRETOKEN_RE.findall(text.lower()):
+            pieces = []
+            start = 0
+            while start < len(word):
+                end = len(word)
+                while end > start:
+                    piece = word[start:end] if start == 0 else '##' + word[start:end]
+                    if piece in self.vocab:
+                        break
+                    end -= 1
+                else:
+                    pieces = []  # no vocabulary piece matches; treat the word as unknown
+                    break
+                pieces.append(self.vocab[piece])
+                start = end
+            ids.extend(pieces)
+        return ids
+    
+    def encode(self, sentences, batch_size=32, normalize_embeddings=False, convert_to_numpy=True):
+        """Mean of the token vectors of each sentence (batch_size is accepted for API parity)"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        
+        embeddings = np.zeros((len(sentences), self.embeddings.shape[1]), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            ids = self._token_ids(sentence)
+            if ids:
+                embeddings[row] = self.embeddings[ids].mean(axis=0)
+        
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.clip(norms, 1e-12, None)
+        
+        return embeddings[0] if single else embeddings
+
+
+def export_static_embeddings(out_dir, model_name='all-MiniLM-L6-v2', batch_size=256):
+    """Distill a StaticEmbedder table from a sentence-transformers model.
+    
+    Each vocabulary token is encoded on its own by the full model, and the
+    resulting vectors become the lookup table.
+    """
+    from sentence_transformers import SentenceTransformer
+    
+    model = SentenceTransformer(model_name)
+    vocab = model.tokenizer.get_vocab()
+    # Skip special and unused entries such as [CLS] and [unused0]
+    tokens = [t for t, _ in sorted(vocab.items(), key=lambda item: item[1])
+              if not (t.startswith('[') and t.endswith(']'))]
+    texts = [t[2:] if t.startswith('##') else t for t in tokens]
+    
+    embeddings = model.encode(texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+    
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, 'embeddings.npy'), embeddings.astype(np.float32))
+    with open(os.path.join(out_dir, 'vocab.json'), 'w', encoding='utf-8') as f:
+        json.dump({token: row for row, token in enumerate(tokens)}, f)
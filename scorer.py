@@ -1,140 +1,387 @@
+import copy
+import hashlib
+import os
 import re
-import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import language_tool_python
-from collections import Counter
-import textstat
+import threading
+import types
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Build outputs of the optional fast encoders (see DEPLOYMENT.md)
+ONNX_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'onnx_int8')
+STATIC_EMBEDDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static_embeddings')
+
+EMBEDDING_BACKENDS = ('auto', 'static', 'onnx', 'transformer')
+GRAMMAR_BACKENDS = ('heuristic', 'languagetool')
+
+# Number of distinct transcripts whose grammar check results are remembered
+GRAMMAR_CACHE_SIZE = 256
+# Number of (transcript, duration) pairs whose full score results are remembered
+RESULT_CACHE_SIZE = 128
+
+_WORD_RE = re.compile(r'\b\w+\b')
+# Words for spell checking: letters only, keeping contractions and possessives
+# ("didn't", "mother's") whole instead of splitting off fragments like 'didn'
+_SPELL_WORD_RE = re.compile(r"[^\W\d_]+(?:['\u2019][^\W\d_]+)*")
+
+def _freeze(value):
+    """Read-only view of a nested dict, so a shared rubric cannot be mutated"""
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+# Scoring rubric based on the Excel sheet; shared (read-only) by every scorer instance
+_RUBRIC = _freeze({
+    'salutation': {
+        'weight': 5,
+        'keywords': ('hi', 'hello', 'good morning', 'good afternoon', 'good evening', 'good day'),
+        'description': 'Proper greeting and salutation at the beginning'
+    },
+    'content_structure': {
+        'weight': 20,
+        # element -> {keyword: inflected forms that also count for it}
+        'keywords': {
+            'name': {'name': (), 'i am': (), "i'm": (), 'myself': ()},
+            'school_class': {
+                'school': ('schools',), 'class': ('classes',), 'grade': ('grades',),
+                'studying': ('study', 'studies', 'studied'), 'student': ('students',)
+            },
+            'family': {
+                'family': ('families',), 'father': (), 'mother': (), 'parents': ('parent',),
+                'brother': ('brothers',), 'sister': ('sisters',), 'siblings': ('sibling',)
+            },
+            'location': {
+                'from': (), 'live': ('lives', 'lived', 'living'), 'city': ('cities',),
+                'town': ('towns',), 'village': ('villages',), 'place': ('places',)
+            },
+            'hobbies': {
+                'hobby': (), 'hobbies': (), 'enjoy': ('enjoys', 'enjoyed', 'enjoying'),
+                'love': ('loves', 'loved', 'loving'), 'like': ('likes', 'liked', 'liking'),
+                'interest': ('interests', 'interested'), 'passion': ('passions',), 'free time': ()
+            }
+        },
+        'order_keywords': ('first', 'firstly', 'second', 'secondly', 'then', 'next', 'finally', 'lastly'),
+        'description': 'Includes name, age, school/class, family, location, and hobbies with good structure'
+    },
+    'speech_rate': {
+        'weight': 10,
+        'ideal_wpm': 130,
+        'min_wpm': 111,
+        'max_wpm': 160,
+        'description': 'Speech rate in words per minute (ideal: 130 WPM)'
+    },
+    'language_grammar': {
+        'weight': 10,
+        'description': 'Grammar correctness and vocabulary richness'
+    },
+    'clarity': {
+        'weight': 15,
+        'filler_words': ('um', 'uh', 'like', 'you know', 'actually', 'basically', 'right', 'i mean', 'well', 'kind of', 'sort of'),
+        'description': 'Minimal use of filler words'
+    },
+    'engagement': {
+        'weight': 15,
+        # word -> inflected forms that also count for it
+        'positive_words': {
+            'happy': ('happily',), 'excited': (), 'passionate': ('passionately',),
+            'love': ('loves', 'loved', 'loving', 'lovely'), 'enjoy': ('enjoys', 'enjoyed', 'enjoying'),
+            'great': ('greatly',), 'wonderful': ('wonderfully',), 'amazing': ('amazingly',),
+            'excellent': (), 'enthusiastic': ('enthusiastically',)
+        },
+        'emotion_keywords': {
+            'feel': ('feels', 'feeling', 'felt'), 'excited': (), 'passionate': (), 'enthusiastic': (),
+            'proud': ('proudly',), 'grateful': (), 'thankful': ()
+        },
+        'description': 'Positive and engaging tone'
+    }
+})
+
+_TOTAL_WEIGHT = sum(criteria['weight'] for criteria in _RUBRIC.values())
+
+# In questions an auxiliary comes first ("does she have"), and the verb after
+# the pronoun is correctly in its base form
+_NOT_AFTER_AUXILIARY = ''.join(
+    rf"(?<!\b{aux} )" for aux in ('does', 'did', 'will', 'would', 'can', 'could', 'should', 'may', 'might', 'must')
+)
+
+# Cheap regex checks for common mistakes in student transcripts; used with a
+# spell checker as a lightweight stand-in for LanguageTool. The rules do not
+# overlap, so one mistake is never counted twice.
+_GRAMMAR_RULES = (
+    re.compile(r"\bi\b"),  # lowercase pronoun 'i'
+    re.compile(r"(?<=\S) {2,}(?=\S)"),  # double spaces between words (not trailing spaces)
+    re.compile(r"(?<=\S)[ \t]+[,.!?]"),  # space before punctuation
+    re.compile(r"[.!?]\s+(?!i\b)[a-z]"),  # sentence starting in lowercase ('i' is caught above)
+    re.compile(_NOT_AFTER_AUXILIARY + r"\b(he|she|it)\s+(are|were|have)\b", re.IGNORECASE),  # subject-verb agreement
+    re.compile(r"\b(you|we|they)\s+(is|was|has|does)\b", re.IGNORECASE),  # subject-verb agreement
+    # Doubled function words; 'that that' and 'had had' can be correct, so only these count
+    re.compile(r"\b(the|a|an|and|or|to|of|in|on|at|my)\s+\1\b", re.IGNORECASE),
+)
+
+_IDEAL_INTRO = "My name is [name], I am [age] years old studying in [class]. I come from [location]. My family consists of my parents and siblings. In my free time, I enjoy [hobbies]."
+
+def _build_keyword_index(rubric):
+    """Assign every rubric keyword a bit index and build one bitmask per category.
+    
+    Keywords are tokenized the same way transcripts are, so "i'm" is stored as
+    the bigram "i m". Keywords are at most two tokens long. Matching whole
+    tokens means the filler 'like' does not count inside 'likely'.
+    
+    Categories given as a mapping list the inflected forms of each keyword
+    ('enjoyed' for 'enjoy'); every form gets its own bit and counts as a hit
+    for that keyword only.
+    """
+    content = rubric['content_structure']
+    categories = {'salutation': rubric['salutation']['keywords']}
+    categories.update(content['keywords'])
+    categories['order'] = content['order_keywords']
+    categories['filler'] = rubric['clarity']['filler_words']
+    categories['positive'] = rubric['engagement']['positive_words']
+    categories['emotion'] = rubric['engagement']['emotion_keywords']
+    
+    kw_to_bit = {}
+    cat_mask = {}
+    cat_keywords = {}  # category -> ((phrase, bits), ...) in rubric order, for display
+    for category, keywords in categories.items():
+        forms = keywords if hasattr(keywords, 'items') else dict.fromkeys(keywords, ())
+        mask = 0
+        entries = []
+        for kw, variants in forms.items():
+            bits = []
+            for form in (kw, *variants):
+                term = ' '.join(_WORD_RE.findall(form))
+                # Shared forms (e.g. 'love' in hobbies and positive words) share a bit
+                bit = kw_to_bit.setdefault(term, len(kw_to_bit))
+                mask |= 1 << bit
+                bits.append(bit)
+            entries.append((kw, tuple(bits)))
+        cat_mask[category] = mask
+        cat_keywords[category] = tuple(entries)
+    return kw_to_bit, cat_mask, cat_keywords
+
+_KW_TO_BIT, _CAT_MASK, _CAT_KEYWORDS = _build_keyword_index(_RUBRIC)
+
+def _digest(text):
+    """Short fixed-size cache key for a potentially long transcript"""
+    return hashlib.blake2b(text.encode()).digest()
+
+def _completed(value):
+    """Future that already holds `value`, for results computed up front"""
+    future = Future()
+    future.set_result(value)
+    return future
+
+class _LRUCache:
+    """Thread-safe least-recently-used mapping with a fixed number of entries"""
+    
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Cached value for `key`, or None"""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
 
 class TranscriptScorer:
-    def __init__(self):
-        # Load sentence transformer model for semantic similarity
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, embedding_backend='auto', grammar_backend='heuristic'):
+        # Load sentence embedding model for semantic similarity
+        self.model = self._load_embedding_model(embedding_backend)
+        
+        # The ideal introduction never changes, so embed it once up front
+        self._ideal_emb = self.model.encode([_IDEAL_INTRO], normalize_embeddings=True, convert_to_numpy=True)
+        
+        # Initialize grammar checker: a spell checker plus regex rules by default,
+        # or LanguageTool (needs Java) for more precise results
+        if grammar_backend not in GRAMMAR_BACKENDS:
+            raise ValueError(f"Unknown grammar backend {grammar_backend!r}; expected one of {GRAMMAR_BACKENDS}")
+        self.grammar_backend = grammar_backend
+        self.grammar_tool = None
+        self.spell_checker = None
+        if grammar_backend == 'languagetool':
+            try:
+                import language_tool_python
+                self.grammar_tool = language_tool_python.LanguageTool(
+                    'en-US', config={'cacheSize': 1000, 'pipelineCaching': True}
+                )
+            except:
+                self.grammar_tool = None
+        else:
+            try:
+                from spellchecker import SpellChecker
+                self.spell_checker = SpellChecker(language='en')
+            except:
+                self.spell_checker = None
+        self._grammar_cache = _LRUCache(GRAMMAR_CACHE_SIZE)
         
-        # Initialize grammar checker
-        try:
-            self.grammar_tool = language_tool_python.LanguageTool('en-US')
-        except:
-            self.grammar_tool = None
+        # Re-scoring the same transcript (e.g. after a Streamlit rerun) is served from here
+        self._result_cache = _LRUCache(RESULT_CACHE_SIZE)
+        
+        # The grammar check and the embedding are the slow steps; run them side by side
+        self._pool = ThreadPoolExecutor(max_workers=4)
         
         # Define rubric criteria
-        self.rubric = self._initialize_rubric()
+        self.rubric = _RUBRIC
+    
+    def _load_embedding_model(self, backend):
+        """Load the sentence encoder for `backend` (one of EMBEDDING_BACKENDS).
+        
+        'auto' uses the static embedding table if it has been built, then the
+        quantized ONNX export, and otherwise the PyTorch transformer.
+        """
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {EMBEDDING_BACKENDS}")
+        
+        if backend == 'static':
+            from encoders import StaticEmbedder
+            return StaticEmbedder(STATIC_EMBEDDINGS_DIR)
+        if backend == 'onnx':
+            from encoders import OnnxEncoder
+            return OnnxEncoder(ONNX_MODEL_DIR)
+        if backend == 'auto':
+            for candidate, path in (('static', STATIC_EMBEDDINGS_DIR), ('onnx', ONNX_MODEL_DIR)):
+                if os.path.isdir(path):
+                    try:
+                        return self._load_embedding_model(candidate)
+                    except Exception:
+                        pass  # missing optional dependency or incomplete build output
+        
+        # Imported here because it pulls in torch and transformers, which take seconds
+        from encoders import TorchEncoder
+        return TorchEncoder('all-MiniLM-L6-v2')
     
-    def _initialize_rubric(self):
-        """Initialize the scoring rubric based on the Excel sheet"""
+    def _found_keywords(self, hits, category):
+        """Phrases of `category` with any of their forms' bits set in `hits`"""
+        return [kw for kw, bits in _CAT_KEYWORDS[category] if any(hits >> bit & 1 for bit in bits)]
+    
+    def _build_context(self, transcript):
+        """Tokenize the transcript once; _score_all adds the keyword tallies"""
+        words = transcript.split()
+        lower = ' '.join(words).lower()
         return {
-            'salutation': {
-                'weight': 5,
-                'keywords': ['hi', 'hello', 'good morning', 'good afternoon', 'good evening', 'good day'],
-                'description': 'Proper greeting and salutation at the beginning'
-            },
-            'content_structure': {
-                'weight': 20,
-                'keywords': {
-                    'name': ['name', 'i am', "i'm", 'myself'],
-                    'school_class': ['school', 'class', 'grade', 'studying', 'student'],
-                    'family': ['family', 'father', 'mother', 'parents', 'brother', 'sister', 'siblings'],
-                    'location': ['from', 'live', 'city', 'town', 'village', 'place'],
-                    'hobbies': ['hobby', 'hobbies', 'enjoy', 'love', 'like', 'interest', 'passion', 'free time']
-                },
-                'order_keywords': ['first', 'firstly', 'second', 'secondly', 'then', 'next', 'finally', 'lastly'],
-                'description': 'Includes name, age, school/class, family, location, and hobbies with good structure'
-            },
-            'speech_rate': {
-                'weight': 10,
-                'ideal_wpm': 130,
-                'min_wpm': 111,
-                'max_wpm': 160,
-                'description': 'Speech rate in words per minute (ideal: 130 WPM)'
-            },
-            'language_grammar': {
-                'weight': 10,
-                'description': 'Grammar correctness and vocabulary richness'
-            },
-            'clarity': {
-                'weight': 15,
-                'filler_words': ['um', 'uh', 'like', 'you know', 'actually', 'basically', 'right', 'i mean', 'well', 'kind of', 'sort of'],
-                'description': 'Minimal use of filler words'
-            },
-            'engagement': {
-                'weight': 15,
-                'positive_words': ['happy', 'excited', 'passionate', 'love', 'enjoy', 'great', 'wonderful', 'amazing', 'excellent', 'enthusiastic'],
-                'description': 'Positive and engaging tone'
-            }
+            'raw': transcript,
+            'lower': lower,
+            'words': words,
+            'word_count': len(words),
+            'tokens': _WORD_RE.findall(lower),
+            # Greetings only count within the first 50 words, i.e. this many tokens
+            # (counted on the lowered prefix: lower() can lengthen text, e.g. 'İ')
+            'salutation_tokens': len(_WORD_RE.findall(' '.join(words[:50]).lower()))
         }
     
-    def _to_python_type(self, value):
-        """Convert numpy types to Python native types for JSON serialization"""
-        if isinstance(value, (np.integer, np.floating)):
-            return float(value)
-        elif isinstance(value, np.ndarray):
-            return value.tolist()
-        return value
-    
     def score_transcript(self, transcript, duration_minutes=1.5):
         """Main scoring function"""
         transcript = transcript.strip()
-        word_count = len(transcript.split())
+        key = (_digest(transcript), float(duration_minutes))
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
         
-        results = {
-            'overall_score': 0,
-            'word_count': word_count,
-            'criteria': []
-        }
+        ctx = self._build_context(transcript)
         
-        # Score each criterion
-        total_weighted_score = 0
-        total_weight = sum([criteria['weight'] for criteria in self.rubric.values()])
-        
-        # 1. Salutation
-        salutation_result = self._score_salutation(transcript)
-        results['criteria'].append(salutation_result)
-        total_weighted_score += salutation_result['score']
-        
-        # 2. Content & Structure
-        content_result = self._score_content_structure(transcript)
-        results['criteria'].append(content_result)
-        total_weighted_score += content_result['score']
-        
-        # 3. Speech Rate
-        speech_rate_result = self._score_speech_rate(transcript, duration_minutes)
-        results['criteria'].append(speech_rate_result)
-        total_weighted_score += speech_rate_result['score']
-        if 'wpm' in speech_rate_result:
-            results['wpm'] = float(speech_rate_result['wpm'])
-        
-        # 4. Language & Grammar
-        grammar_result = self._score_grammar(transcript)
-        results['criteria'].append(grammar_result)
-        total_weighted_score += grammar_result['score']
-        
-        # 5. Clarity (Filler words)
-        clarity_result = self._score_clarity(transcript)
-        results['criteria'].append(clarity_result)
-        total_weighted_score += clarity_result['score']
-        
-        # 6. Engagement
-        engagement_result = self._score_engagement(transcript)
-        results['criteria'].append(engagement_result)
-        total_weighted_score += engagement_result['score']
-        
-        # Calculate overall score (normalized to 100)
-        results['overall_score'] = float((total_weighted_score / total_weight) * 100)
+        # Grammar check and embedding run side by side while the tokens are tallied
+        grammar_future = self._pool.submit(self._count_grammar_errors, ctx)
+        semantic_future = self._pool.submit(self._calculate_semantic_similarity, ctx['raw'])
         
+        results = self._assemble_results(ctx, duration_minutes, semantic_future, grammar_future)
+        self._result_cache.put(key, copy.deepcopy(results))
         return results
     
-    def _score_salutation(self, transcript):
+    def score_transcripts(self, transcripts, durations=None, batch_size=32):
+        """Score many transcripts, embedding all of them in one batched encode call"""
+        if durations is None:
+            durations = [1.5] * len(transcripts)
+        if len(durations) != len(transcripts):
+            raise ValueError("Expected one duration per transcript")
+        
+        transcripts = [t.strip() for t in transcripts]
+        keys = [(_digest(t), float(d)) for t, d in zip(transcripts, durations)]
+        results = [self._result_cache.get(key) for key in keys]
+        results = [copy.deepcopy(r) if r is not None else None for r in results]
+        
+        # Only transcripts that are not cached go through the model
+        missing = [i for i, r in enumerate(results) if r is None]
+        contexts = [self._build_context(transcripts[i]) for i in missing]
+        grammar_futures = [self._pool.submit(self._count_grammar_errors, ctx) for ctx in contexts]
+        semantic_scores = self._batch_semantic_similarity(contexts, batch_size)
+        
+        for i, ctx, semantic_score, grammar_future in zip(missing, contexts, semantic_scores, grammar_futures):
+            results[i] = self._assemble_results(ctx, durations[i], _completed(semantic_score), grammar_future)
+            self._result_cache.put(keys[i], copy.deepcopy(results[i]))
+        return results
+    
+    def _assemble_results(self, ctx, duration_minutes, semantic_future, grammar_future):
+        """Score every criterion and combine them into the overall result"""
+        criteria = self._score_all(ctx, duration_minutes, semantic_future, grammar_future)
+        total_weighted_score = sum(criterion['score'] for criterion in criteria)
+        
+        return {
+            # Overall score normalized to 100
+            'overall_score': float((total_weighted_score / _TOTAL_WEIGHT) * 100),
+            'word_count': ctx['word_count'],
+            'criteria': criteria,
+            'wpm': criteria[2]['wpm']
+        }
+    
+    def _score_all(self, ctx, duration_minutes, semantic_future, grammar_future):
+        """Tally every rubric keyword in one walk over the tokens, then build the six criteria.
+        
+        The walk runs while the semantic similarity and grammar futures are still
+        computing; they are only awaited by the criteria that need them.
+        """
+        keyword_counts = [0] * len(_KW_TO_BIT)
+        keyword_mask = 0
+        salutation_mask = 0
+        unique_tokens = set()
+        salutation_tokens = ctx['salutation_tokens']
+        
+        previous = None
+        for i, token in enumerate(ctx['tokens']):
+            unique_tokens.add(token)
+            # Look the token up as a unigram and, with its predecessor, as a bigram
+            bigram = f"{previous} {token}" if previous is not None else None
+            previous = token
+            for bit in (_KW_TO_BIT.get(token), _KW_TO_BIT.get(bigram)):
+                if bit is None:
+                    continue
+                keyword_counts[bit] += 1
+                keyword_mask |= 1 << bit
+                if i < salutation_tokens:
+                    salutation_mask |= 1 << bit
+        
+        ctx['keyword_counts'] = keyword_counts
+        ctx['keyword_mask'] = keyword_mask
+        ctx['salutation_mask'] = salutation_mask
+        ctx['unique_tokens'] = unique_tokens
+        
+        return [
+            self._score_salutation(ctx),
+            self._score_content_structure(ctx, semantic_future.result()),
+            self._score_speech_rate(ctx, duration_minutes),
+            self._score_grammar(ctx, grammar_future.result()),
+            self._score_clarity(ctx),
+            self._score_engagement(ctx)
+        ]
+    
+    def _score_salutation(self, ctx):
         """Score salutation/greeting"""
         criteria = self.rubric['salutation']
         max_score = criteria['weight']
         
-        # Check for keywords in the first 50 words
-        first_part = ' '.join(transcript.split()[:50]).lower()
-        
-        found_keywords = []
-        for keyword in criteria['keywords']:
-            if keyword in first_part:
-                found_keywords.append(keyword)
+        # Keywords in the first 50 words
+        hits = ctx['salutation_mask'] & _CAT_MASK['salutation']
+        found_keywords = self._found_keywords(hits, 'salutation')
         
         # Scoring: 0-5 based on number and quality of greetings
         if len(found_keywords) >= 3:
@@ -154,42 +401,36 @@ class TranscriptScorer:
             'name': 'Salutation',
             'score': float(score),
             'max_score': float(max_score),
+            'progress': score / max_score if max_score else 0.0,
             'feedback': feedback,
             'keywords_found': found_keywords
         }
     
-    def _score_content_structure(self, transcript):
+    def _score_content_structure(self, ctx, semantic_score):
         """Score content completeness and structure"""
         criteria = self.rubric['content_structure']
         max_score = criteria['weight']
         
-        transcript_lower = transcript.lower()
+        keyword_mask = ctx['keyword_mask']
         
         # Check for each key element
         elements_found = {}
         all_keywords_found = []
         
-        for element, keywords in criteria['keywords'].items():
-            found = any(kw in transcript_lower for kw in keywords)
-            elements_found[element] = found
-            if found:
-                matched = [kw for kw in keywords if kw in transcript_lower]
-                all_keywords_found.extend(matched)
+        for element in criteria['keywords']:
+            matched = self._found_keywords(keyword_mask, element)
+            elements_found[element] = bool(matched)
+            all_keywords_found.extend(matched)
         
         # Check for structural flow
-        order_words = [word for word in criteria['order_keywords'] if word in transcript_lower]
-        has_structure = len(order_words) > 0
+        has_structure = (keyword_mask & _CAT_MASK['order']) != 0
         
         # Calculate score
         elements_count = sum(elements_found.values())
         element_score = (elements_count / len(criteria['keywords'])) * 0.7  # 70% for elements
         structure_score = 0.3 if has_structure else 0.1  # 30% for structure
         
-        # Semantic similarity with ideal introduction
-        ideal_intro = "My name is [name], I am [age] years old studying in [class]. I come from [location]. My family consists of my parents and siblings. In my free time, I enjoy [hobbies]."
-        semantic_score = self._calculate_semantic_similarity(transcript, ideal_intro)
-        
-        # Combined score
+        # Combined score (semantic_score: similarity with the ideal introduction)
         final_ratio = (element_score + structure_score + semantic_score * 0.2) / 1.2
         score = final_ratio * max_score
         
@@ -206,6 +447,7 @@ class TranscriptScorer:
             'name': 'Content & Structure',
             'score': float(score),
             'max_score': float(max_score),
+            'progress': score / max_score if max_score else 0.0,
             'feedback': feedback,
             'keywords_found': all_keywords_found[:10],  # Limit to 10 for display
             'details': {
@@ -215,13 +457,12 @@ class TranscriptScorer:
             }
         }
     
-    def _score_speech_rate(self, transcript, duration_minutes):
+    def _score_speech_rate(self, ctx, duration_minutes):
         """Score speech rate (WPM)"""
         criteria = self.rubric['speech_rate']
         max_score = criteria['weight']
         
-        word_count = len(transcript.split())
-        wpm = word_count / duration_minutes
+        wpm = ctx['word_count'] / duration_minutes
         
         ideal_wpm = criteria['ideal_wpm']
         min_wpm = criteria['min_wpm']
@@ -248,6 +489,7 @@ class TranscriptScorer:
             'name': 'Speech Rate',
             'score': float(score),
             'max_score': float(max_score),
+            'progress': score / max_score if max_score else 0.0,
             'feedback': feedback,
             'wpm': float(wpm),
             'details': {
@@ -256,39 +498,34 @@ class TranscriptScorer:
             }
         }
     
-    def _score_grammar(self, transcript):
+    def _score_grammar(self, ctx, grammar_errors):
         """Score grammar and vocabulary"""
         criteria = self.rubric['language_grammar']
         max_score = criteria['weight']
         
-        word_count = len(transcript.split())
+        word_count = ctx['word_count']
         
-        # Grammar check
+        # Grammar check (grammar_errors is None if the checker is not available)
         grammar_score = max_score * 0.6  # Default if tool not available
-        grammar_errors = 0
         
-        if self.grammar_tool:
-            try:
-                matches = self.grammar_tool.check(transcript)
-                grammar_errors = len(matches)
-                
-                # Score based on errors per 100 words
-                error_rate = (grammar_errors / word_count) * 100 if word_count > 0 else 0
-                
-                if error_rate < 3:
-                    grammar_score = max_score * 0.6
-                elif error_rate < 5:
-                    grammar_score = max_score * 0.5
-                elif error_rate < 10:
-                    grammar_score = max_score * 0.4
-                else:
-                    grammar_score = max_score * 0.3
-            except:
-                pass
+        if grammar_errors is None:
+            grammar_errors = 0
+        else:
+            # Score based on errors per 100 words
+            error_rate = (grammar_errors / word_count) * 100 if word_count > 0 else 0
+            
+            if error_rate < 3:
+                grammar_score = max_score * 0.6
+            elif error_rate < 5:
+                grammar_score = max_score * 0.5
+            elif error_rate < 10:
+                grammar_score = max_score * 0.4
+            else:
+                grammar_score = max_score * 0.3
         
         # Vocabulary richness (TTR - Type-Token Ratio)
-        words = re.findall(r'\b\w+\b', transcript.lower())
-        unique_words = set(words)
+        words = ctx['tokens']
+        unique_words = ctx['unique_tokens']
         ttr = len(unique_words) / len(words) if words else 0
         
         # TTR scoring
@@ -317,6 +554,7 @@ class TranscriptScorer:
             'name': 'Language & Grammar',
             'score': float(score),
             'max_score': float(max_score),
+            'progress': score / max_score if max_score else 0.0,
             'feedback': f"{grammar_feedback} {vocab_feedback}",
             'details': {
                 'Grammar errors': int(grammar_errors),
@@ -325,23 +563,53 @@ class TranscriptScorer:
             }
         }
     
-    def _score_clarity(self, transcript):
+    def _count_grammar_errors(self, ctx):
+        """Number of grammar issues found by the configured backend; None if it is unavailable"""
+        if self.grammar_backend == 'languagetool':
+            return self._count_languagetool_errors(ctx['raw'])
+        return self._count_heuristic_errors(ctx)
+    
+    def _count_heuristic_errors(self, ctx):
+        """Distinct misspelled words plus regex rule hits"""
+        if not self.spell_checker:
+            return None
+        
+        words = {w.replace('\u2019', "'") for w in _SPELL_WORD_RE.findall(ctx['lower'])}
+        unknown = self.spell_checker.unknown(words)
+        # A possessive of a known word ("ravi's") is not a misspelling
+        misspellings = sum(1 for w in unknown if "'" not in w or self.spell_checker.unknown([w.split("'")[0]]))
+        rule_hits = sum(len(rule.findall(ctx['raw'])) for rule in _GRAMMAR_RULES)
+        return misspellings + rule_hits
+    
+    def _count_languagetool_errors(self, transcript):
+        """Number of LanguageTool matches, cached per transcript; None if the tool is unavailable"""
+        if not self.grammar_tool:
+            return None
+        
+        key = _digest(transcript)
+        grammar_errors = self._grammar_cache.get(key)
+        if grammar_errors is not None:
+            return grammar_errors
+        
+        try:
+            grammar_errors = len(self.grammar_tool.check(transcript))
+        except:
+            return None
+        
+        self._grammar_cache.put(key, grammar_errors)
+        return grammar_errors
+    
+    def _score_clarity(self, ctx):
         """Score clarity based on filler words"""
         criteria = self.rubric['clarity']
         max_score = criteria['weight']
         
-        transcript_lower = transcript.lower()
-        word_count = len(transcript.split())
+        word_count = ctx['word_count']
         
-        # Count filler words
-        filler_count = 0
-        found_fillers = []
-        
-        for filler in criteria['filler_words']:
-            count = transcript_lower.count(filler)
-            if count > 0:
-                filler_count += count
-                found_fillers.append(filler)
+        # Count filler words (unigrams and bigrams) from the keyword counts
+        keyword_counts = ctx['keyword_counts']
+        filler_count = int(sum(keyword_counts[bit] for _, bits in _CAT_KEYWORDS['filler'] for bit in bits))
+        found_fillers = [kw for kw, bits in _CAT_KEYWORDS['filler'] if any(keyword_counts[bit] for bit in bits)]
         
         # Calculate filler word ratio
         filler_ratio = (filler_count / word_count * 100) if word_count > 0 else 0
@@ -364,6 +632,7 @@ class TranscriptScorer:
             'name': 'Clarity',
             'score': float(score),
             'max_score': float(max_score),
+            'progress': score / max_score if max_score else 0.0,
             'feedback': feedback,
             'details': {
                 'Filler words count': int(filler_count),
@@ -372,20 +641,20 @@ class TranscriptScorer:
             }
         }
     
-    def _score_engagement(self, transcript):
+    def _score_engagement(self, ctx):
         """Score engagement based on positive/enthusiastic tone"""
         criteria = self.rubric['engagement']
         max_score = criteria['weight']
         
-        transcript_lower = transcript.lower()
+        keyword_mask = ctx['keyword_mask']
         
         # Count positive words
-        positive_count = sum(1 for word in criteria['positive_words'] if word in transcript_lower)
-        found_positive = [word for word in criteria['positive_words'] if word in transcript_lower]
+        positive_hits = keyword_mask & _CAT_MASK['positive']
+        found_positive = self._found_keywords(positive_hits, 'positive')
+        positive_count = len(found_positive)  # 'enjoy' and 'enjoyed' are one word
         
         # Sentiment/emotion keywords
-        emotion_keywords = ['feel', 'excited', 'passionate', 'enthusiastic', 'proud', 'grateful', 'thankful']
-        has_emotion = any(word in transcript_lower for word in emotion_keywords)
+        has_emotion = (keyword_mask & _CAT_MASK['emotion']) != 0
         
         # Calculate engagement score
         positive_score = min(positive_count / 3, 1.0) * 0.7  # Up to 70% for positive words
@@ -408,6 +677,7 @@ class TranscriptScorer:
             'name': 'Engagement',
             'score': float(score),
             'max_score': float(max_score),
+            'progress': score / max_score if max_score else 0.0,
             'feedback': feedback,
             'keywords_found': found_positive,
             'details': {
@@ -416,11 +686,32 @@ class TranscriptScorer:
             }
         }
     
-    def _calculate_semantic_similarity(self, text1, text2):
-        """Calculate semantic similarity between two texts"""
+    def _calculate_semantic_similarity(self, text):
+        """Calculate semantic similarity between the text and the ideal introduction"""
         try:
-            embeddings = self.model.encode([text1, text2])
-            similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-            return float(max(0, similarity))  # Ensure non-negative and Python float
+            # Both embeddings are L2-normalized, so the dot product is the cosine similarity
+            emb = self.model.encode([text], normalize_embeddings=True, convert_to_numpy=True)
+            return float(max(0.0, emb[0] @ self._ideal_emb[0]))  # Ensure non-negative and Python float
         except:
             return 0.5  # Default similarity if calculation fails
+    
+    def _batch_semantic_similarity(self, contexts, batch_size=32):
+        """Similarity with the ideal introduction for many transcripts at once"""
+        if not contexts:
+            return []
+        try:
+            # Encode in length order so each batch pads to similar lengths, then unsort
+            order = sorted(range(len(contexts)), key=lambda i: contexts[i]['word_count'])
+            embs = self.model.encode(
+                [contexts[i]['raw'] for i in order],
+                batch_size=batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True
+            )
+            sims = embs @ self._ideal_emb[0]
+            scores = [0.0] * len(contexts)
+            for position, i in enumerate(order):
+                scores[i] = float(max(0.0, sims[position]))
+            return scores
+        except:
+            return [0.5] * len(contexts)  # Same default as the single-transcript path